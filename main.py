@@ -1,6 +1,10 @@
+import argparse
 import logging
+import os
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
+
 import pyautogui
 import cv2
 
@@ -9,12 +13,14 @@ from src.automation import (
     close_notepad,
     ensure_notepad_closed,
     launch_notepad,
+    launch_notepad_fast,
     save_file,
+    save_file_direct,
     type_text,
-    wait_before_next_iteration,
+    wait_for_notepad_closed,
 )
 from src.icon_detector import IconDetector
-from src.utils import annotate_screenshot, capture_screenshot, ensure_directory, get_desktop_path
+from src.utils import annotate_screenshot, capture_screenshot, ensure_directory, get_desktop_path, opencv_simd_summary
 
 logging.basicConfig(
     level=logging.INFO,
@@ -29,11 +35,66 @@ logger = logging.getLogger(__name__)
 
 pyautogui.FAILSAFE = True
 
-
-def main():
+ANNOTATION_SCALE = 0.5
+
+# Annotated screenshots are encoded off the main loop, OpenCV releases the GIL while writing
+_io_pool = ThreadPoolExecutor(max_workers=1)
+
+
+def detect_icon(detector, screenshots_dir, post_id):
+    # The review image only needs the desktop in gray, annotate_screenshot adds color for the marks
+    screenshot = capture_screenshot(grayscale=True)
+    x, y, confidence = detector.detect_with_retry(max_retries=3, retry_delay=1.0)
+
+    if not detector.validate_icon_detection(x, y, confidence):
+        return None
+
+    # Save annotated screenshot, downscaled since it is only for human review
+    small = cv2.resize(screenshot, None, fx=ANNOTATION_SCALE, fy=ANNOTATION_SCALE, interpolation=cv2.INTER_AREA)
+    annotated = annotate_screenshot(
+        small,
+        int(x * ANNOTATION_SCALE), int(y * ANNOTATION_SCALE),
+        width=int(60 * ANNOTATION_SCALE),
+        height=int(60 * ANNOTATION_SCALE),
+        label="Notepad Icon",
+        confidence=confidence
+    )
+    screenshot_path = screenshots_dir / f"detection_post_{post_id}.jpg"
+    _io_pool.submit(cv2.imwrite, str(screenshot_path), annotated, [cv2.IMWRITE_JPEG_QUALITY, 85])
+    logger.info(f"Saving screenshot: {screenshot_path}")
+
+    return x, y
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Vision-Based Desktop Automation")
+    parser.add_argument(
+        "--ui-save",
+        action="store_true",
+        help="Save through Notepad's Save As dialog instead of writing the file directly"
+    )
+    parser.add_argument(
+        "--via-icon",
+        action="store_true",
+        help="Launch Notepad by detecting and double-clicking its desktop icon instead of starting notepad.exe"
+    )
+    parser.add_argument(
+        "--single-session",
+        action="store_true",
+        help="Keep one Notepad window open for all posts instead of relaunching it for each one"
+    )
+    args = parser.parse_args()
+    # Save As is only offered for an untitled document, a reused window would save over the previous post
+    if args.single_session and args.ui_save:
+        parser.error("--single-session cannot be combined with --ui-save")
+    return args
+
+
+def main(ui_save=False, via_icon=False, single_session=False):
     logger.info("="*60)
     logger.info("Vision-Based Desktop Automation - Starting")
     logger.info("="*60)
+    logger.info(f"OpenCV {cv2.__version__}, SIMD baseline | dispatch: {opencv_simd_summary()}")
 
     # Minimize editor
     pyautogui.hotkey('win', 'd')
@@ -56,7 +117,8 @@ def main():
         sys.exit(1)
 
     # Step 3: Validate posts
-    valid_posts = [post for post in posts if validate_post(post)]
+    # Validate and format in one pass, the loop only needs the id and the text
+    valid_posts = [(post['id'], format_post_content(post)) for post in posts if validate_post(post)]
     if len(valid_posts) < len(posts):
         logger.warning(f"Some posts were invalid. Using {len(valid_posts)} valid posts")
 
@@ -73,96 +135,109 @@ def main():
     ensure_directory(str(screenshots_dir))
 
     logger.info(f"Output directory: {output_dir}")
+    # Paths inside the loop are plain strings, joined without building Path objects per post
+    output_dir_str = str(output_dir)
 
     # Step 5: Process each post
     successful_saves = 0
     failed_saves = 0
+    icon_position = None
+    # Set while a single-session window is open and can take the next post
+    notepad_open = False
 
-    for i, post in enumerate(valid_posts, 1):
+    for i, (post_id, content) in enumerate(valid_posts, 1):
         logger.info("\n" + "-"*60)
-        logger.info(f"Processing post {i}/{len(valid_posts)} (ID: {post['id']})")
+        logger.info(f"Processing post {i}/{len(valid_posts)} (ID: {post_id})")
         logger.info("-"*60)
 
         try:
-            # Capture desktop screenshot
-            screenshot = capture_screenshot()
-
-            # Detect Notepad icon
-            x, y, confidence = detector.detect_with_retry(max_retries=3, retry_delay=1.0)
-
-            if not detector.validate_icon_detection(x, y, confidence):
-                logger.error(f"Failed to detect icon for post {post['id']}")
-                failed_saves += 1
-                continue
-
-            # Save annotated screenshot
-            annotated = annotate_screenshot(
-                screenshot,
-                x, y,
-                width=60,
-                height=60,
-                label="Notepad Icon",
-                confidence=confidence
-            )
-            screenshot_filename = f"detection_post_{post['id']}.png"
-            screenshot_path = screenshots_dir / screenshot_filename
-            cv2.imwrite(str(screenshot_path), annotated)
-            logger.info(f"Screenshot saved: {screenshot_path}")
-
-            # Launch Notepad
-            if not launch_notepad(x, y, timeout=5.0):
-                logger.error(f"Failed to launch Notepad for post {post['id']}")
-                failed_saves += 1
-                ensure_notepad_closed()
-                continue
+            # Detect Notepad icon once and reuse it, the desktop does not change between posts
+            if via_icon and icon_position is None:
+                icon_position = detect_icon(detector, screenshots_dir, post_id)
+                if icon_position is None:
+                    logger.error(f"Failed to detect icon for post {post_id}")
+                    failed_saves += 1
+                    continue
+
+            # Launch Notepad, a single session reuses the window from the previous post
+            if not notepad_open:
+                if via_icon:
+                    launched = launch_notepad(*icon_position, timeout=5.0)
+                else:
+                    launched = launch_notepad_fast(timeout=5.0)
+
+                if not launched:
+                    logger.error(f"Failed to launch Notepad for post {post_id}")
+                    failed_saves += 1
+                    ensure_notepad_closed()
+                    # Cached position may be stale, re-detect on the next post
+                    icon_position = None
+                    continue
+                notepad_open = single_session
 
             # Type post content
             try:
-                content = format_post_content(post)
                 type_text(content)
             except Exception as e:
                 logger.error(f"Error typing content: {e}")
-                close_notepad()
+                close_notepad(discard_changes=not ui_save)
+                notepad_open = False
                 failed_saves += 1
                 continue
 
             # Save file (will overwrite if exists)
-            filename = f"post_{post['id']}.txt"
-            filepath = output_dir / filename
+            filename = f"post_{post_id}.txt"
+            filepath = os.path.join(output_dir_str, filename)
 
-            if filepath.exists():
+            if os.path.exists(filepath):
                 logger.info(f"File will be overwritten: {filepath}")
 
-            if not save_file(filename, str(output_dir)):
-                logger.error(f"Failed to save file for post {post['id']}")
-                close_notepad()
+            if ui_save:
+                saved = save_file(filename, output_dir_str)
+            else:
+                saved = save_file_direct(content, filepath)
+
+            if not saved:
+                logger.error(f"Failed to save file for post {post_id}")
+                close_notepad(discard_changes=not ui_save)
                 ensure_notepad_closed()
+                notepad_open = False
                 failed_saves += 1
                 continue
 
             successful_saves += 1
-            logger.info(f"Successfully saved post {post['id']}")
+            logger.info(f"Successfully saved post {post_id}")
 
-            # Close Notepad
-            close_notepad()
-            time.sleep(1.0)
+            # Close Notepad, a directly written post leaves unsaved text behind to discard
+            if not notepad_open:
+                close_notepad(discard_changes=not ui_save)
+                # Move on as soon as the window is gone instead of sleeping a fixed worst case
+                if not wait_for_notepad_closed(timeout=2.5):
+                    logger.warning("Notepad still open after closing")
 
-            # Wait before next iteration
             if i < len(valid_posts):
                 logger.info(f"Completed post {i}/{len(valid_posts)}")
-                wait_before_next_iteration(delay=0.5)
 
         except KeyboardInterrupt:
             logger.info("\nProcess interrupted by user")
             ensure_notepad_closed()
+            notepad_open = False
             break
         except Exception as e:
-            logger.error(f"Unexpected error processing post {post['id']}: {e}")
+            logger.error(f"Unexpected error processing post {post_id}: {e}")
             ensure_notepad_closed()
+            notepad_open = False
             failed_saves += 1
             continue
 
+    if notepad_open:
+        close_notepad(discard_changes=True)
+        if not wait_for_notepad_closed(timeout=2.5):
+            logger.warning("Notepad still open after closing")
+
     # Step 6: Summary
+    _io_pool.shutdown(wait=True)
+
     logger.info("\n" + "="*60)
     logger.info("AUTOMATION COMPLETE")
     logger.info("="*60)
@@ -175,8 +250,9 @@ def main():
     if successful_saves > 0:
         print(f"\n✓ Successfully saved {successful_saves} post(s) to:")
         print(f"  {output_dir}")
-        print(f"\n✓ Annotated detection screenshots saved to:")
-        print(f"  {screenshots_dir}")
+        if via_icon:
+            print(f"\n✓ Annotated detection screenshots saved to:")
+            print(f"  {screenshots_dir}")
 
     if failed_saves > 0:
         print(f"\n⚠ {failed_saves} post(s) failed to save. Check the log for details.")
@@ -184,7 +260,8 @@ def main():
 
 if __name__ == "__main__":
     try:
-        main()
+        args = parse_args()
+        main(ui_save=args.ui_save, via_icon=args.via_icon, single_session=args.single_session)
     except KeyboardInterrupt:
         logger.info("\nApplication interrupted by user")
         ensure_notepad_closed()
@@ -193,3 +270,5 @@ if __name__ == "__main__":
         logger.error(f"Fatal error: {e}", exc_info=True)
         ensure_notepad_closed()
         sys.exit(1)
+    finally:
+        _io_pool.shutdown(wait=True)
@@ -1,25 +1,77 @@
+import json
 import logging
-from typing import Dict, List
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
 
 import requests
+from requests.adapters import HTTPAdapter
 
 logger = logging.getLogger(__name__)
 
+POSTS_URL = "https://jsonplaceholder.typicode.com/posts"
+CACHE_PATH = Path.home() / ".cache" / "vba" / "posts.json"
+CACHE_MAX_AGE = 3600
+REQUIRED_FIELDS = frozenset(("id", "title", "body"))
+CACHE_FIELDS = frozenset(("url", "etag", "fetched_at", "posts"))
+
+# Shared session keeps the TLS connection alive across calls
+_session = requests.Session()
+_session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=4))
+
 
 def fetch_posts(limit: int = 10) -> List[Dict]:
+    cached = _load_cache()
+    if cached and time.time() - cached["fetched_at"] < CACHE_MAX_AGE:
+        logger.info("Using cached posts")
+        return cached["posts"][:limit]
+
+    # Revalidate a stale cache with its ETag, a 304 means the cached body is still current
+    headers = {"If-None-Match": cached["etag"]} if cached and cached.get("etag") else {}
     try:
-        response = requests.get("https://jsonplaceholder.typicode.com/posts", timeout=10)
+        response = _session.get(POSTS_URL, headers=headers, timeout=10)
+        if response.status_code == 304 and cached:
+            logger.info("Posts not modified, using cached posts")
+            _save_cache(cached["etag"], cached["posts"])
+            return cached["posts"][:limit]
+
         response.raise_for_status()
-        return response.json()[:limit]
-    except Exception as e:
+        posts = response.json()
+        _save_cache(response.headers.get("ETag"), posts)
+        return posts[:limit]
+    except (requests.RequestException, ValueError) as e:
         logger.error(f"Error fetching posts: {e}")
         raise
 
 
+def _load_cache() -> Optional[Dict]:
+    try:
+        with open(CACHE_PATH, encoding="utf-8") as f:
+            cached = json.load(f)
+        # A hand-edited or foreign cache file is ignored rather than failing the run
+        if not isinstance(cached, dict) or not CACHE_FIELDS <= cached.keys():
+            return None
+        if cached["url"] != POSTS_URL:
+            return None
+        if not isinstance(cached["fetched_at"], (int, float)) or not isinstance(cached["posts"], list):
+            return None
+        return cached
+    except (OSError, ValueError):
+        return None
+
+
+def _save_cache(etag: Optional[str], posts: List[Dict]) -> None:
+    try:
+        CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        with open(CACHE_PATH, "w", encoding="utf-8") as f:
+            json.dump({"url": POSTS_URL, "etag": etag, "fetched_at": time.time(), "posts": posts}, f)
+    except OSError as e:
+        logger.warning(f"Failed to cache posts: {e}")
+
+
 def format_post_content(post: Dict) -> str:
     return f"Title: {post.get('title', '')}\n\n{post.get('body', '')}"
 
 
 def validate_post(post: Dict) -> bool:
-    return all(field in post for field in ["id", "title", "body"])
-
+    return post.keys() >= REQUIRED_FIELDS
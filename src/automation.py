@@ -1,30 +1,46 @@
 import logging
+import os
+import subprocess
+import sys
 import time
 
 import pyautogui
 import pygetwindow as gw
+import pyperclip
+
+from . import winkeys, winwindows
 
 logger = logging.getLogger(__name__)
 
 pyautogui.FAILSAFE = True
-pyautogui.PAUSE = 0.1
+# No implicit sleep after every call, functions wait explicitly where the GUI needs to settle
+pyautogui.PAUSE = 0
+
+# Shorter texts are typed directly, longer ones are pasted from the clipboard
+PASTE_MIN_LENGTH = 32
+
+# Notepad's top-level window class and title suffix, Notepad++ and other editors have their own
+NOTEPAD_CLASS = "Notepad"
+NOTEPAD_TITLE_SUFFIX = " - Notepad"
+
+# Window opened by the last launch, the only one typed into and closed
+_notepad_window = None
+# Notepad windows that were open before the last launch, never closed by this run
+_existing_windows = None
 
 
 def launch_notepad(icon_x: int, icon_y: int, timeout: float = 5.0) -> bool:
     try:
+        # Windows that were already open, e.g. the user's own document, are never taken for the launched one
+        existing = _find_notepad_windows()
         pyautogui.moveTo(icon_x, icon_y, duration=0.3)
         time.sleep(0.3)
 
         pyautogui.doubleClick(icon_x, icon_y, interval=0.1)
-        time.sleep(0.3)
 
-        start_time = time.time()
-        while time.time() - start_time < timeout:
-            windows = gw.getWindowsWithTitle("Notepad")
-            if windows:
-                logger.info("Notepad launched")
-                return True
-            time.sleep(0.3)
+        if wait_for_notepad_window(existing, timeout):
+            logger.info("Notepad launched")
+            return True
 
         logger.warning("Notepad window not detected")
         return False
@@ -34,12 +50,69 @@ def launch_notepad(icon_x: int, icon_y: int, timeout: float = 5.0) -> bool:
         return False
 
 
-def type_text(text: str, interval: float = 0.02) -> None:
+def launch_notepad_fast(timeout: float = 5.0) -> bool:
+    try:
+        existing = _find_notepad_windows()
+        # Start the executable directly, skipping icon detection and the mouse round-trip
+        flags = subprocess.DETACHED_PROCESS if sys.platform == 'win32' else 0
+        subprocess.Popen(['notepad.exe'], creationflags=flags)
+
+        if wait_for_notepad_window(existing, timeout):
+            logger.info("Notepad launched")
+            return True
+
+        logger.warning("Notepad window not detected")
+        return False
+
+    except OSError as e:
+        logger.error(f"Error launching Notepad: {e}")
+        return False
+
+
+def _launched_windows() -> list:
+    if _existing_windows is None:
+        return []
+    return [window for window in _find_notepad_windows() if window not in _existing_windows]
+
+
+def _activate_window(window) -> bool:
+    if winwindows.is_supported():
+        return winwindows.activate_window(window)
+    window.activate()
+    return True
+
+
+def wait_for_notepad_window(existing: list, timeout: float = 5.0, poll_interval: float = 0.05) -> bool:
+    global _notepad_window, _existing_windows
+    _notepad_window = None
+    _existing_windows = existing
+    start_time = time.time()
+    if winwindows.is_supported():
+        # Sleep on window events instead of polling, the loop below confirms the window is a new one
+        winwindows.wait_for_window_event(
+            "Notepad", timeout, already_open=lambda: bool(_launched_windows()), exclude=existing
+        )
+
+    while True:
+        window = next(iter(_launched_windows()), None)
+        # Typing goes to the foreground window, so the launch only counts once ours is there
+        if window is not None and _activate_window(window):
+            _notepad_window = window
+            return True
+        if time.time() - start_time >= timeout:
+            if window is not None:
+                logger.warning("Notepad opened but could not be brought to the foreground")
+            return False
+        time.sleep(poll_interval)
+
+
+def type_text(text: str) -> None:
     try:
-        pyautogui.hotkey('ctrl', 'a')
-        time.sleep(0.2)
+        # SendInput events are queued in order, no settle time needed before typing
+        winkeys.hotkey('ctrl', 'a')
 
-        pyautogui.write(text, interval=interval)
+        if len(text) < PASTE_MIN_LENGTH or not _paste_text(text):
+            winkeys.write(text)
         time.sleep(0.3)
         logger.info(f"Typed {len(text)} characters")
 
@@ -48,85 +121,161 @@ def type_text(text: str, interval: float = 0.02) -> None:
         raise
 
 
-def save_file(filename: str, directory: str) -> bool:
+def _paste_text(text: str) -> bool:
     try:
-        import os
-        filepath = os.path.join(directory, filename)
+        pyperclip.copy(text)
+        if pyperclip.paste() != text:
+            logger.warning("Clipboard round-trip mismatch, falling back to typing")
+            return False
+    except pyperclip.PyperclipException as e:
+        logger.warning(f"Clipboard unavailable, falling back to typing: {e}")
+        return False
 
-        pyautogui.hotkey('ctrl', 's')
-        time.sleep(1.0)
+    winkeys.hotkey('ctrl', 'v')
+    return True
 
-        pyautogui.write(filepath, interval=0.02)
-        time.sleep(0.3)
 
-        pyautogui.press('enter')
-        time.sleep(0.8)
+def _wait_for_hwnd(title_substr: str, timeout: float, poll: float = 0.005) -> bool:
+    deadline = time.perf_counter() + timeout
+    while True:
+        if winwindows.is_supported():
+            found = winwindows.find_windows(title_substr)
+        else:
+            found = gw.getWindowsWithTitle(title_substr)
+        if found:
+            return True
+        if time.perf_counter() >= deadline:
+            return False
+        time.sleep(poll)
+
+
+def save_file(filename: str, directory: str) -> bool:
+    filepath = os.path.join(directory, filename)
+    previous_mtime = os.path.getmtime(filepath) if os.path.exists(filepath) else None
+
+    try:
+        winkeys.hotkey('ctrl', 's')
+        if not _wait_for_hwnd("Save As", 2.0):
+            logger.warning("Save As dialog not detected")
+
+        winkeys.write(filepath)
+        winkeys.press('enter')
 
         # Handle file overwrite confirmation
-        try:
-            confirm_windows = gw.getWindowsWithTitle("Confirm Save As")
-            if confirm_windows:
-                confirm_windows[0].activate()
-                time.sleep(0.3)
-                pyautogui.press('y')
-                time.sleep(0.5)
-        except:
-            pass
+        if previous_mtime is not None and _wait_for_hwnd("Confirm Save As", 0.5):
+            winkeys.press('y')
 
-        time.sleep(0.5)
-        if os.path.exists(filepath):
-            logger.info(f"File saved: {filepath}")
-            return True
-        else:
-            logger.warning("File may not have been saved")
-            return False
+        deadline = time.perf_counter() + 3.0
+        while time.perf_counter() < deadline:
+            if os.path.exists(filepath) and os.path.getmtime(filepath) != previous_mtime:
+                logger.info(f"File saved: {filepath}")
+                return True
+            time.sleep(0.005)
+
+        logger.warning("File may not have been saved")
+        return False
 
     except Exception as e:
         logger.error(f"Error saving file: {e}")
         return False
 
 
-def close_notepad() -> None:
+def save_file_direct(content: str, filepath: str) -> bool:
+    # Write next to the target and rename, so a partially written file is never left behind
+    tmp_path = f"{filepath}.tmp"
     try:
-        notepad_windows = gw.getWindowsWithTitle('Notepad')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        os.replace(tmp_path, filepath)
+        logger.info(f"File saved: {filepath}")
+        return True
 
-        if not notepad_windows:
-            all_windows = gw.getAllTitles()
-            for title in all_windows:
-                if 'Notepad' in title or 'notepad' in title:
-                    notepad_windows = gw.getWindowsWithTitle(title)
-                    break
+    except OSError as e:
+        logger.error(f"Error saving file: {e}")
+        # Don't leave a half-written temp file next to the posts
+        try:
+            os.remove(tmp_path)
+        except FileNotFoundError:
+            pass
+        except OSError as cleanup_error:
+            logger.warning(f"Could not remove {tmp_path}: {cleanup_error}")
+        return False
 
-        if notepad_windows:
-            notepad_windows[0].close()
-            time.sleep(0.5)
+
+def _find_notepad_windows() -> list:
+    if winwindows.is_supported():
+        return winwindows.find_windows('notepad', class_name=NOTEPAD_CLASS)
+    return [
+        window for window in gw.getAllWindows()
+        if window.visible and (window.title == 'Notepad' or window.title.endswith(NOTEPAD_TITLE_SUFFIX))
+    ]
+
+
+def _close_window(window) -> None:
+    if winwindows.is_supported():
+        winwindows.close_window(window)
+    else:
+        window.close()
+
+
+def _window_exists(window) -> bool:
+    if winwindows.is_supported():
+        return winwindows.is_window(window)
+    return window in gw.getAllWindows()
+
+
+def _discard_changes(window) -> None:
+    if not winwindows.is_supported():
+        logger.warning("Save prompt can't be located without Win32, leaving Notepad open")
+        return
+
+    # The classic prompt is a dialog owned by the window, the Store Notepad shows it inside the window itself
+    prompt = winwindows.find_owned_window(window)
+    if prompt is None and winwindows.is_window(window):
+        prompt = window
+    if prompt is None:
+        return
+
+    # "Don't save" only goes to the prompt this close raised, never to whatever window has the focus
+    if winwindows.activate_window(prompt):
+        winkeys.press('n')
+    else:
+        logger.warning("Save prompt could not be brought to the foreground, leaving Notepad open")
+
+
+def close_notepad(discard_changes: bool = False) -> None:
+    try:
+        if _notepad_window is not None:
+            _close_window(_notepad_window)
+
+            # Answer "Don't save" if the unsaved-changes prompt kept the window open
+            if not wait_for_notepad_closed(timeout=0.5) and discard_changes:
+                _discard_changes(_notepad_window)
             logger.info("Notepad closed")
 
     except Exception as e:
         logger.error(f"Error closing Notepad: {e}")
 
 
+def wait_for_notepad_closed(timeout: float = 2.5, poll_interval: float = 0.05) -> bool:
+    deadline = time.perf_counter() + timeout
+    # Only the window this run closed is watched, other Notepad windows may stay open
+    while _notepad_window is not None and _window_exists(_notepad_window):
+        if time.perf_counter() >= deadline:
+            return False
+        time.sleep(poll_interval)
+    return True
+
+
 def ensure_notepad_closed() -> None:
     try:
-        for attempt in range(2):
-            notepad_windows = gw.getWindowsWithTitle('Notepad')
-
-            if not notepad_windows:
-                all_windows = gw.getAllTitles()
-                for title in all_windows:
-                    if 'Notepad' in title or 'notepad' in title:
-                        notepad_windows = gw.getWindowsWithTitle(title)
-                        break
-
-            if notepad_windows:
-                notepad_windows[0].close()
-                time.sleep(0.3)
-            else:
-                break
+        # Includes a window that showed up after a launch timed out, but none the user had open before
+        notepad_windows = _launched_windows()
+
+        for window in notepad_windows:
+            _close_window(window)
+        if notepad_windows:
+            time.sleep(0.3)
 
     except Exception as e:
         logger.debug(f"Error ensuring Notepad is closed: {e}")
-
-
-def wait_before_next_iteration(delay: float = 1.0) -> None:
-    time.sleep(delay)
@@ -1,163 +1,509 @@
+import functools
+import hashlib
 import logging
+import os
+import re
 import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import cv2
+import numpy as np
 import pytesseract
-from PIL import Image
 
-from .utils import capture_screenshot, save_candidate_screenshots
+try:
+    import tesserocr
+except ImportError:
+    tesserocr = None
+
+from .utils import capture_screenshot, opencv_simd_features, save_candidate_screenshots
 
 logger = logging.getLogger(__name__)
 
 TEMPLATE_MATCH_THRESHOLD = 0.85
+EARLY_EXIT_CONFIDENCE = 0.97  # Neighbouring scales still reach ~0.95, stop only on a near-exact size
+SOFT_MARGIN = 0.0  # Template matches this close below the threshold are accepted without running OCR
 MAX_RETRIES = 3
 RETRY_DELAY = 1.0
 ICON_TEMPLATE_PATH = Path(__file__).parent.parent / "assets" / "notepad_icon.png"
+PYRAMID_LEVELS = 2
+PYRAMID_MIN_TEMPLATE_SIDE = 8
+PYRAMID_TOP_K = 3
+PYRAMID_REFINE_PAD = 8
+PYRAMID_REJECT_RATIO = 2.0
+VARIANCE_MASK_RATIO = 0.5  # Windows flatter than this fraction of the template's variance can't hold the icon
+OCR_CACHE_SIZE = 4
+# Text region pre-segmentation, sizes in screen pixels
+OCR_ROI_KERNEL = 15
+OCR_ROI_MIN_AREA = 20
+OCR_ROI_MAX_AREA = 80000
+
+# Alternatives in score order: exact, prefix, first occurrence is a standalone word, anywhere.
+# [^\W_] is an alphanumeric character, DOTALL lets multi-line OCR text match past a newline
+NOTEPAD_PATTERN = re.compile(r"(notepad\Z)|(notepad)|(?:(?!notepad).)*(?<![^\W_])(notepad)(?![^\W_])|.*?notepad", re.DOTALL)
+
+# Multi-scale matching: 50% to 250% of template size
+TEMPLATE_SCALES = (0.5, 0.7, 0.8, 0.9, 1.0, 1.1, 1.2, 1.3, 1.5, 1.8, 2.0, 2.5)
+
+# OpenCV's CPU feature id for AVX2, not exported as a constant by every build
+CPU_AVX2 = getattr(cv2, "CPU_AVX2", 11)
+
+
+#Make sure OpenCV dispatches to its SIMD kernels, and warn when the installed build has no AVX2 path
+def _check_opencv_build():
+    cv2.setUseOptimized(True)
+    baseline, dispatched = opencv_simd_features()
+    if cv2.checkHardwareSupport(CPU_AVX2) and "AVX2" not in baseline + dispatched:
+        logger.warning("OpenCV was built without AVX2, install an AVX2-enabled opencv-python for faster template matching")
+
+
+_check_opencv_build()
+
+# Scales run one per worker, so OpenCV's own threading is turned off to keep the workers from oversubscribing
+# the cores. setNumThreads is process-wide: every OpenCV call in the process, OCR preprocessing and
+# main's annotation resize included, runs single-threaded once this module is imported.
+cv2.setNumThreads(1)
+_MATCH_POOL = ThreadPoolExecutor(max_workers=min(4, os.cpu_count() or 1))
+
+# In-process Tesseract, initialized once when tesserocr and its language data are available
+_tess_api = None
+
+
+#Single-channel view of a screenshot, BGR input is converted once
+def _to_gray(image):
+    if image.ndim == 2:
+        return image
+    return cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+
+
+#Wrap an image for OpenCV's transparent API, so filters run through OpenCL when a device is available
+def _to_umat(image):
+    if isinstance(image, cv2.UMat) or not (cv2.ocl.haveOpenCL() and cv2.ocl.useOpenCL()):
+        return image
+    return cv2.UMat(image)
+
+
+#Download a UMat result back into a NumPy array, plain arrays pass through
+def _from_umat(image):
+    return image.get() if isinstance(image, cv2.UMat) else image
+
+
+#Score an OCR token against "notepad", memoized since OCR repeats the same tokens across retries
+@functools.lru_cache(maxsize=4096)
+def _similarity_cached(text_lower):
+    match = NOTEPAD_PATTERN.match(text_lower)
+    if match is None:
+        return 0.0
+
+    if match.lastindex == 1:
+        return 1.0
+    if match.lastindex == 2:
+        return 0.6 + (0.2 * len("notepad") / len(text_lower))
+    if match.lastindex == 3:
+        return 0.6
+    return 0.4
+
+
+#Templates big enough to survive downscaling are searched coarse-to-fine, the rest at full resolution
+def _uses_pyramid(width, height):
+    return min(width, height) >> 1 >= PYRAMID_MIN_TEMPLATE_SIDE
+
+
+#Downscaled copies of a template for the coarse-to-fine search, stopping before it gets too small to match
+def _template_pyramid(template):
+    template_pyramid = [template]
+    while len(template_pyramid) <= PYRAMID_LEVELS and min(template.shape) >> len(template_pyramid) >= PYRAMID_MIN_TEMPLATE_SIDE:
+        template_pyramid.append(cv2.pyrDown(template_pyramid[-1]))
+    return template_pyramid
+
+
+#Read a template and derive its scaled set, shared by every detector using the same path
+@functools.lru_cache(maxsize=4)
+def _load_template_cached(path_str):
+    template_gray = cv2.cvtColor(cv2.imread(path_str), cv2.COLOR_BGR2GRAY)
+
+    # Resized and pyrDown'd once here instead of on every detection
+    template_h, template_w = template_gray.shape
+    scaled_templates = []
+    for scale in sorted(TEMPLATE_SCALES, key=lambda s: abs(s - 1.0)):
+        width, height = int(template_w * scale), int(template_h * scale)
+        # Area averaging keeps shrunk templates alias-free, bilinear is the better fit for enlarging
+        interpolation = cv2.INTER_AREA if scale < 1.0 else cv2.INTER_LINEAR
+        resized_template = cv2.resize(template_gray, (width, height), interpolation=interpolation)
+        scaled_templates.append((scale, resized_template, width, height, _template_pyramid(resized_template)))
+
+    return template_gray, scaled_templates
+
+
+#Create the shared tesserocr API, None when the binding or its language data is missing
+def _get_tess_api():
+    global _tess_api, tesserocr
+    if _tess_api is None and tesserocr is not None:
+        try:
+            _tess_api = tesserocr.PyTessBaseAPI(psm=tesserocr.PSM.SPARSE_TEXT)
+        except RuntimeError as e:
+            logger.warning(f"tesserocr unavailable, using pytesseract: {e}")
+            tesserocr = None
+    return _tess_api
+
+
+#Probe for an OCR engine once, the pytesseract version call spawns a process
+@functools.lru_cache(maxsize=1)
+def _tesseract_available():
+    if _get_tess_api() is not None:
+        return True
+    try:
+        pytesseract.get_tesseract_version()
+        return True
+    except (pytesseract.TesseractNotFoundError, OSError):
+        logger.warning("Tesseract not found, OCR fallback disabled")
+        return False
+
+
+#Word boxes in pytesseract's image_to_data dict layout, in-process through tesserocr when possible
+def _image_to_data(image):
+    api = _get_tess_api()
+    if api is None:
+        # PSM 11 (sparse text - works best for desktop icons)
+        return pytesseract.image_to_data(image, output_type=pytesseract.Output.DICT, config='--psm 11')
+
+    # Raw 8-bit gray bytes, no PIL image in between
+    height, width = image.shape
+    api.SetImageBytes(image.tobytes(), width, height, 1, width)
+    api.Recognize()
+    ocr_data = {'text': [], 'left': [], 'top': [], 'width': [], 'height': [], 'conf': []}
+    iterator = api.GetIterator()
+    if iterator is None:
+        return ocr_data
+
+    level = tesserocr.RIL.WORD
+    for word in tesserocr.iterate_level(iterator, level):
+        box = word.BoundingBox(level)
+        if box is None:
+            continue
+        x1, y1, x2, y2 = box
+        ocr_data['text'].append(word.GetUTF8Text(level) or '')
+        ocr_data['left'].append(x1)
+        ocr_data['top'].append(y1)
+        ocr_data['width'].append(x2 - x1)
+        ocr_data['height'].append(y2 - y1)
+        ocr_data['conf'].append(word.Confidence(level))
+    return ocr_data
+
+
+#Blank everything outside edge-dense regions and crop to them, returns (image, x0, y0) or None
+def _text_region_image(source, image):
+    edges = cv2.Canny(_to_umat(source), 100, 200)
+    dilated = cv2.dilate(edges, np.ones((OCR_ROI_KERNEL, OCR_ROI_KERNEL), np.uint8))
+    contours, _ = cv2.findContours(_from_umat(dilated), cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    rois = [cv2.boundingRect(c) for c in contours if OCR_ROI_MIN_AREA < cv2.contourArea(c) < OCR_ROI_MAX_AREA]
+    if not rois:
+        return None
+
+    # Fill with black or white, whichever the image leans towards, so the blanked area reads as plain background
+    background = 255 if cv2.mean(image)[0] > 127 else 0
+    masked = np.full_like(image, background)
+    for x, y, w, h in rois:
+        masked[y:y + h, x:x + w] = image[y:y + h, x:x + w]
+
+    x0 = min(x for x, _, _, _ in rois)
+    y0 = min(y for _, y, _, _ in rois)
+    x1 = max(x + w for x, _, w, _ in rois)
+    y1 = max(y + h for _, y, _, h in rois)
+    return masked[y0:y1, x0:x1], x0, y0
 
 
 class IconDetector:
 
     #Initialize the IconDetector 
-    def __init__(self, template_path=None, confidence_threshold=TEMPLATE_MATCH_THRESHOLD):
-        self.template_path = template_path or ICON_TEMPLATE_PATH
+    def __init__(self, template_path=None, confidence_threshold=TEMPLATE_MATCH_THRESHOLD, ocr_preprocess=False,
+                 search_roi=None, soft_margin=SOFT_MARGIN):
         self.confidence_threshold = confidence_threshold
+        # A borderline template match is rarely improved by OCR, accept it within this margin instead
+        self.soft_margin = soft_margin
+        # Denoise, CLAHE and Otsu before OCR, only worth it on noisy captures
+        self.ocr_preprocess = ocr_preprocess
+        # (x0, y0, x1, y1) screen region to search, None searches the whole screen
+        self.search_roi = search_roi
+        self._ocr_cache = OrderedDict()
+        # ((frame digest, detection settings), result) of the last successful detect_with_retry
+        self._last_detection = None
+        self.template_path = template_path or ICON_TEMPLATE_PATH
+
+    #Reassigning the template path reloads the template and its precomputed scales
+    @property
+    def template_path(self):
+        return self._template_path
+
+    @template_path.setter
+    def template_path(self, path):
+        self._template_path = Path(path)
         self.template_gray = None
+        self._last_detection = None
+        if self._template_path.exists():
+            self._load_template()
+
+    #Load the template and precompute everything derived from it
+    def _load_template(self):
+        self.template_gray, self._scaled_templates = _load_template_cached(str(self.template_path))
+        self._template_shape = self.template_gray.shape
 
-        if self.template_path.exists():
-            template = cv2.imread(str(self.template_path))
-            self.template_gray = cv2.cvtColor(template, cv2.COLOR_BGR2GRAY)
-            logger.info(f"Template loaded: {self.template_gray.shape}")
+        logger.info(f"Template loaded: {self._template_shape}")
 
     #Detect the icon position
     def detect_icon_position(self, screenshot=None, use_ocr_fallback=True):
 
         if screenshot is None:
-            screenshot = capture_screenshot()
+            screenshot = capture_screenshot(grayscale=True)
+
+        # Both detectors only see the search region, positions are shifted back to screen space
+        offset_x = offset_y = 0
+        if self.search_roi is not None:
+            offset_x, offset_y, x1, y1 = self.search_roi
+            screenshot = screenshot[offset_y:y1, offset_x:x1]
+
+        # Converted once and shared, template matching and OCR both work on a single channel
+        screenshot_gray = _to_gray(screenshot)
 
         # Try template matching first
         if self.template_gray is not None:
-            x, y, confidence = self._detect_with_template_matching(screenshot)
-            if confidence >= self.confidence_threshold:
+            x, y, confidence = self._detect_with_template_matching(screenshot_gray)
+            if x is not None and confidence >= self.confidence_threshold - self.soft_margin:
+                x, y = x + offset_x, y + offset_y
                 logger.info(f"Template match found at ({x}, {y}), conf={confidence:.2f}")
                 return x, y, confidence
 
         # Fallback to OCR
         if use_ocr_fallback:
             logger.info("Using OCR fallback...")
-            x, y, confidence = self._detect_with_ocr(screenshot)
+            x, y, confidence = self._detect_with_ocr(screenshot_gray, screenshot)
             if x is not None:
+                x, y = x + offset_x, y + offset_y
                 logger.info(f"OCR found at ({x}, {y}), conf={confidence:.2f}")
                 return x, y, confidence
 
         return None, None, 0.0
 
     #Detect the icon position with template matching
-    def _detect_with_template_matching(self, screenshot):
+    def _detect_with_template_matching(self, screenshot_gray):
+        # matchTemplate copies strided input internally, a cropped or sliced frame is compacted once here
+        screenshot_gray = np.ascontiguousarray(screenshot_gray)
+        screen_h, screen_w = screenshot_gray.shape
+        screen_pyramid = [screenshot_gray]
+        for _ in range(PYRAMID_LEVELS):
+            screen_pyramid.append(cv2.pyrDown(screen_pyramid[-1]))
+
+        # matchTemplate releases the GIL, so scales run concurrently on the pool
+        feasible = [entry for entry in self._scaled_templates if entry[2] <= screen_w and entry[3] <= screen_h]
+
+        def match(entry):
+            return self._match_scale(screenshot_gray, screen_pyramid, entry)
+
+        # Scales are ordered outward from native size, a near-certain match cancels the ones not yet started
+        early_exit = max(EARLY_EXIT_CONFIDENCE, self.confidence_threshold)
+        futures = [_MATCH_POOL.submit(match, entry) for entry in feasible]
+        results = []
+        for index, future in enumerate(futures):
+            results.append(future.result())
+            if results[-1][0] >= early_exit:
+                for pending in futures[index + 1:]:
+                    pending.cancel()
+                break
 
-        screenshot_gray = cv2.cvtColor(screenshot, cv2.COLOR_BGR2GRAY)
         best_match = None
         best_confidence = 0.0
-        best_scale = 1.0
-
-        # Multi-scale matching: 50% to 250% of template size
-        scales = [0.5, 0.7, 0.8, 0.9, 1.0, 1.1, 1.2, 1.3, 1.5, 1.8, 2.0, 2.5]
-
-        for scale in scales:
-            width = int(self.template_gray.shape[1] * scale)
-            height = int(self.template_gray.shape[0] * scale)
-
-            if width > screenshot_gray.shape[1] or height > screenshot_gray.shape[0]:
-                continue
-
-            resized_template = cv2.resize(self.template_gray, (width, height))
-            result = cv2.matchTemplate(screenshot_gray, resized_template, cv2.TM_CCOEFF_NORMED)
-            _, max_val, _, max_loc = cv2.minMaxLoc(result)
-
+        best_size = (0, 0)
+        for max_val, max_loc, width, height in results:
             if max_val > best_confidence:
                 best_confidence = max_val
                 best_match = max_loc
-                best_scale = scale
+                best_size = (width, height)
 
-        if best_match and best_confidence >= self.confidence_threshold:
-            template_w = int(self.template_gray.shape[1] * best_scale)
-            template_h = int(self.template_gray.shape[0] * best_scale)
-            x = best_match[0] + template_w // 2
-            y = best_match[1] + template_h // 2
+        # The caller applies the threshold, so a borderline match can still be accepted within soft_margin
+        if best_match:
+            x = best_match[0] + best_size[0] // 2
+            y = best_match[1] + best_size[1] // 2
             return x, y, best_confidence
 
         return None, None, best_confidence
 
 
-    #Detect the icon position with OCR
-    def _detect_with_ocr(self, screenshot):
-       
-        # Preprocess for OCR
-        gray = cv2.cvtColor(screenshot, cv2.COLOR_BGR2GRAY)
-        denoised = cv2.bilateralFilter(gray, 9, 75, 75)  # Reduce noise
-        clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))  # Increase contrast
-        contrast = clahe.apply(denoised)
-        _, binary = cv2.threshold(contrast, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)  # Binary threshold
-
-        # Run OCR with PSM 11 (sparse text - works best for desktop icons)
-        pil_image = Image.fromarray(binary)
-        try:
-            ocr_data = pytesseract.image_to_data(
-                pil_image,
-                output_type=pytesseract.Output.DICT,
-                config='--psm 11'
-            )
-            all_text = [t.strip() for t in ocr_data.get('text', []) if t.strip()]
-            logger.info(f"OCR detected {len(all_text)} texts")
-        except:
+    #Match a single scaled template against the screenshot
+    def _match_scale(self, screenshot_gray, screen_pyramid, entry):
+        _, resized_template, width, height, template_pyramid = entry
+        if _uses_pyramid(width, height):
+            max_val, max_loc = self._pyramid_detect(screen_pyramid, template_pyramid)
+        else:
+            # Full-frame spatial match, the one place an OpenCL device can take over the heavy lifting
+            result = cv2.matchTemplate(_to_umat(screenshot_gray), resized_template, cv2.TM_CCOEFF_NORMED)
+            _, max_val, _, max_loc = cv2.minMaxLoc(result)
+        return max_val, max_loc, width, height
+
+    #Coarse-to-fine search: SQDIFF peaks at the coarsest level, refined in small ROIs on the way up
+    def _pyramid_detect(self, screen_pyramid, template_pyramid):
+
+        levels = len(template_pyramid) - 1
+        coarse_screen, coarse_template = screen_pyramid[levels], template_pyramid[levels]
+        if coarse_template.shape[0] > coarse_screen.shape[0] or coarse_template.shape[1] > coarse_screen.shape[1]:
+            return 0.0, None
+
+        # Take the top-K minima, masking out each peak's neighbourhood before the next
+        # The coarse pass scans the whole frame, so it runs on OpenCL when available; peak masking needs it back on the host
+        result = _from_umat(cv2.matchTemplate(_to_umat(coarse_screen), coarse_template, cv2.TM_SQDIFF))
+        coarse_h, coarse_w = coarse_template.shape
+        min_variance = np.var(coarse_template) * VARIANCE_MASK_RATIO
+        peaks = []
+        for _ in range(PYRAMID_TOP_K * 4):
+            min_val, _, min_loc, _ = cv2.minMaxLoc(result)
+            # Bound rejection: peaks far worse than the best one can't win after refinement
+            if len(peaks) == PYRAMID_TOP_K or (peaks and min_val > peaks[0][0] * PYRAMID_REJECT_RATIO):
+                break
+            x, y = min_loc
+            # Flat background windows can't hold the icon, skip them without spending a refinement
+            if np.var(coarse_screen[y:y + coarse_h, x:x + coarse_w]) >= min_variance:
+                peaks.append((min_val, min_loc))
+            result[max(0, y - coarse_h // 2):y + coarse_h // 2 + 1,
+                   max(0, x - coarse_w // 2):x + coarse_w // 2 + 1] = np.finfo(np.float32).max
+
+        best_confidence, best_loc = 0.0, None
+        level_best_sqdiff = [np.inf] * levels
+        for _, (x, y) in peaks:
+            for level in range(levels - 1, 0, -1):
+                sqdiff, (x, y) = self._match_in_roi(screen_pyramid[level], template_pyramid[level], x * 2, y * 2, cv2.TM_SQDIFF)
+                # Running-min bound: drop a peak once it is far behind the best seen at this level
+                if sqdiff > level_best_sqdiff[level] * PYRAMID_REJECT_RATIO:
+                    break
+                level_best_sqdiff[level] = min(level_best_sqdiff[level], sqdiff)
+            else:
+                value, (x, y) = self._match_in_roi(screen_pyramid[0], template_pyramid[0], x * 2, y * 2, cv2.TM_CCOEFF_NORMED)
+                if value > best_confidence:
+                    best_confidence, best_loc = value, (x, y)
+
+        return best_confidence, best_loc
+
+    #Match the template only within a padded window around (x, y)
+    def _match_in_roi(self, screen, template, x, y, method):
+        tmpl_h, tmpl_w = template.shape
+        x0 = max(0, x - PYRAMID_REFINE_PAD)
+        y0 = max(0, y - PYRAMID_REFINE_PAD)
+        x1 = min(screen.shape[1], x + tmpl_w + PYRAMID_REFINE_PAD)
+        y1 = min(screen.shape[0], y + tmpl_h + PYRAMID_REFINE_PAD)
+
+        result = cv2.matchTemplate(screen[y0:y1, x0:x1], template, method)
+        min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(result)
+        if method == cv2.TM_SQDIFF:
+            return min_val, (x0 + min_loc[0], y0 + min_loc[1])
+        return max_val, (x0 + max_loc[0], y0 + max_loc[1])
+
+    #Detect the icon position with OCR, the color screenshot is only used to annotate candidates
+    def _detect_with_ocr(self, screenshot_gray, screenshot=None):
+        if not _tesseract_available():
             return None, None, 0.0
 
-        # Find and score "notepad" matches
-        candidates = []
-        for i, text in enumerate(ocr_data.get('text', [])):
-            text_clean = text.strip()
-            if not text_clean:
-                continue
-
-            similarity = self._calculate_similarity_to_notepad(text_clean)
-            if similarity > 0.0:
-                x = ocr_data['left'][i]
-                y = ocr_data['top'][i]
-                w = ocr_data['width'][i]
-                h = ocr_data['height'][i]
-                ocr_conf = ocr_data.get('conf', [0])[i] if 'conf' in ocr_data else 0
-
-                # Icon is above text label
-                icon_x = x + w // 2
-                icon_y = int(y - max(h * 3, 60) / 2)
-
-                # Combined score: similarity weighted with OCR confidence
-                combined_score = (similarity * 0.9) + ((ocr_conf / 100.0) * 0.1)
-                candidates.append({
-                    'text': text_clean,
-                    'x': icon_x,
-                    'y': icon_y,
-                    'score': combined_score
-                })
-
-        if not candidates:
+        gray = np.ascontiguousarray(screenshot_gray)
+
+        # Retries on a static desktop produce identical frames, reuse their OCR output
+        cache_key = (gray.shape, self.ocr_preprocess, hashlib.blake2b(gray, digest_size=16).digest())
+        ocr_data = self._ocr_cache.get(cache_key)
+        if ocr_data is not None:
+            self._ocr_cache.move_to_end(cache_key)
+            logger.info("Screen unchanged, reusing OCR results")
+        else:
+            # OCR at full resolution, ~12 px desktop labels are lost once downscaled
+            if self.ocr_preprocess:
+                # Filters stay on the OpenCL device when there is one, only the OCR input is downloaded
+                denoised = cv2.GaussianBlur(_to_umat(gray), (3, 3), 0)  # Reduce noise
+                clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))  # Increase contrast
+                contrast = clahe.apply(denoised)
+                _, binary = cv2.threshold(contrast, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)  # Binary threshold
+                ocr_input = _from_umat(binary)
+            else:
+                # Tesseract binarizes internally and reads anti-aliased screen text better from raw gray
+                denoised = ocr_input = gray
+
+            # OCR only the text-like regions, most of the desktop is wallpaper
+            region = _text_region_image(denoised, ocr_input)
+            if region is None:
+                logger.info("No text-like regions found, skipping OCR")
+                return None, None, 0.0
+            roi_image, roi_x, roi_y = region
+
+            # Run OCR in sparse text mode
+            try:
+                ocr_data = _image_to_data(roi_image)
+                ocr_data['left'] = [left + roi_x for left in ocr_data['left']]
+                ocr_data['top'] = [top + roi_y for top in ocr_data['top']]
+                all_text = [t.strip() for t in ocr_data.get('text', []) if t.strip()]
+                logger.info(f"OCR detected {len(all_text)} texts")
+            except:
+                return None, None, 0.0
+
+            self._ocr_cache[cache_key] = ocr_data
+            if len(self._ocr_cache) > OCR_CACHE_SIZE:
+                self._ocr_cache.popitem(last=False)
+
+        # Only tokens containing "notepad" can score above zero, filter them in one vectorized pass
+        texts = np.array([t.strip().lower() for t in ocr_data.get('text', [])], dtype=str)
+        if texts.size == 0:
+            return None, None, 0.0
+        idxs = np.flatnonzero(np.char.find(texts, "notepad") >= 0)
+        if idxs.size == 0:
             return None, None, 0.0
 
-        save_candidate_screenshots(screenshot, candidates)
-
-        best = max(candidates, key=lambda c: c['score'])
+        lefts = np.asarray(ocr_data['left'])[idxs]
+        tops = np.asarray(ocr_data['top'])[idxs]
+        widths = np.asarray(ocr_data['width'])[idxs]
+        heights = np.asarray(ocr_data['height'])[idxs]
+        confs = np.asarray(ocr_data['conf'], dtype=np.float64)[idxs] if 'conf' in ocr_data else np.zeros(idxs.size)
+        similarities = np.array([_similarity_cached(texts[i]) for i in idxs])
+
+        # Icon is above text label
+        icon_xs = lefts + widths // 2
+        icon_ys = (tops - np.maximum(heights * 3, 60) / 2).astype(int)
+
+        # Combined score: similarity weighted with OCR confidence
+        combined_scores = (similarities * 0.9) + ((confs / 100.0) * 0.1)
+        candidates = [
+            {
+                'text': ocr_data['text'][i].strip(),
+                'x': int(icon_x),
+                'y': int(icon_y),
+                'score': float(score)
+            }
+            for i, icon_x, icon_y, score in zip(idxs, icon_xs, icon_ys, combined_scores)
+        ]
+
+        save_candidate_screenshots(screenshot if screenshot is not None else screenshot_gray, candidates)
+
+        best = candidates[int(np.argmax(combined_scores))]
         logger.info(f"Best: '{best['text']}' at ({best['x']}, {best['y']})")
         return best['x'], best['y'], min(best['score'], 0.9)
 
     #Detect the icon position with retry
     def detect_with_retry(self, max_retries=MAX_RETRIES, retry_delay=RETRY_DELAY):
 
+        previous_digest = None
         for attempt in range(max_retries):
             logger.info(f"Detection attempt {attempt + 1}/{max_retries}")
-            x, y, confidence = self.detect_icon_position()
-
-            if x is not None:
-                return x, y, confidence
+            # Detection only needs gray, capturing it directly skips the BGR frame entirely
+            screenshot = capture_screenshot(grayscale=True)
+
+            # A frame identical to the last failed one would fail again, skip straight to the next wait
+            digest = hashlib.blake2b(np.ascontiguousarray(screenshot), digest_size=16).digest()
+            # An unchanged screen under unchanged settings gives the same answer, exact digest so a moved icon never matches
+            cache_key = (digest, (self.search_roi, self.confidence_threshold, self.soft_margin, self.ocr_preprocess))
+            if self._last_detection is not None and self._last_detection[0] == cache_key:
+                logger.info("Screen unchanged since last detection, reusing its result")
+                return self._last_detection[1]
+            if digest == previous_digest:
+                logger.info("Screen unchanged since last attempt, skipping detection")
+            else:
+                x, y, confidence = self.detect_icon_position(screenshot)
+                if x is not None:
+                    self._last_detection = (cache_key, (x, y, confidence))
+                    return x, y, confidence
+            previous_digest = digest
 
             if attempt < max_retries - 1:
                 time.sleep(retry_delay)
@@ -167,33 +513,13 @@ class IconDetector:
 
     #Calculate the similarity to the notepad
     def _calculate_similarity_to_notepad(self, text):
-        text_lower = text.strip().lower()
-        target = "notepad"
-
-        if text_lower == target:
-            return 1.0
-
-        if text_lower.startswith(target):
-            notepad_ratio = len(target) / len(text_lower)
-            return 0.6 + (0.2 * notepad_ratio)
-
-        if target in text_lower:
-            idx = text_lower.find(target)
-            is_word_start = (idx == 0 or not text_lower[idx - 1].isalnum())
-            is_word_end = (idx + len(target) >= len(text_lower) or not text_lower[idx + len(target)].isalnum())
-
-            if is_word_start and is_word_end:
-                return 0.6
-            else:
-                return 0.4
-
-        return 0.0
+        return _similarity_cached(text.strip().lower())
 
     #Validate the icon detection
     def validate_icon_detection(self, x, y, confidence):
         if x is None or y is None:
             return False
-        if confidence < self.confidence_threshold:
+        if confidence < self.confidence_threshold - self.soft_margin:
             return False
         if x < 0 or x > 1920 or y < 0 or y > 1080:
             return False
@@ -1,22 +1,80 @@
+import functools
+import logging
+import os
 import time
 from pathlib import Path
 
 import cv2
+import mss
 import numpy as np
-import pyautogui
 
-
-def capture_screenshot(save_path=None):
-    screenshot = pyautogui.screenshot()
+try:
+    import dxcam
+except ImportError:
+    dxcam = None
+
+logger = logging.getLogger(__name__)
+
+# Annotation styling
+LABEL_FONT = cv2.FONT_HERSHEY_SIMPLEX
+LABEL_FONT_SCALE = 0.6
+LABEL_THICKNESS = 2
+BOX_COLOR = (0, 255, 0)
+DOT_COLOR = (0, 0, 255)
+
+# Candidate screenshots only show the surroundings of each hit, (width, height) around its center
+CANDIDATE_CROP_SIZE = (400, 200)
+
+# Reused across captures, setting up the capture API is not free on Windows
+_sct = None
+_camera = None
+# Directories already created this run, mkdir is only issued once per path
+_known_dirs = set()
+
+
+#Grab the primary monitor through DXGI Desktop Duplication, None when unavailable or unchanged
+def _grab_dxcam():
+    global _camera, dxcam
+    if dxcam is None:
+        return None
+    if _camera is None:
+        try:
+            _camera = dxcam.create(output_color="BGR")
+        except Exception:
+            # No duplication support (e.g. remote sessions), stay on mss from now on
+            dxcam = None
+            return None
+
+    # grab() returns None when nothing changed since the previous frame
+    return _camera.grab()
+
+
+#Capture the primary monitor as BGR, or straight to single-channel gray for detection-only callers
+def capture_screenshot(save_path=None, grayscale=False):
+    global _sct
+
+    screenshot = _grab_dxcam()
+    if screenshot is None:
+        if _sct is None:
+            _sct = mss.mss()
+
+        raw = _sct.grab(_sct.monitors[1])
+        bgra = np.frombuffer(raw.bgra, dtype=np.uint8).reshape(raw.height, raw.width, 4)
+        # One conversion from the raw buffer, no intermediate BGR frame when only gray is needed
+        screenshot = cv2.cvtColor(bgra, cv2.COLOR_BGRA2GRAY if grayscale else cv2.COLOR_BGRA2BGR)
+    elif grayscale:
+        screenshot = cv2.cvtColor(screenshot, cv2.COLOR_BGR2GRAY)
     if save_path:
-        screenshot.save(save_path)
-    screenshot_np = np.array(screenshot)
-    return cv2.cvtColor(screenshot_np, cv2.COLOR_RGB2BGR)
+        cv2.imwrite(str(save_path), screenshot)
+    return screenshot
 
 
 def ensure_directory(path):
     dir_path = Path(path)
-    dir_path.mkdir(parents=True, exist_ok=True)
+    key = os.fspath(dir_path)
+    if key not in _known_dirs:
+        dir_path.mkdir(parents=True, exist_ok=True)
+        _known_dirs.add(key)
     return dir_path
 
 
@@ -28,50 +86,83 @@ def handle_existing_file(filepath):
     return filepath
 
 
+#Pixel extent of a label, the same few labels are measured over and over
+@functools.lru_cache(maxsize=128)
+def _text_extent(text):
+    return cv2.getTextSize(text, LABEL_FONT, LABEL_FONT_SCALE, LABEL_THICKNESS)
+
+
 def annotate_screenshot(image, x, y, width=50, height=50, label="Detected", confidence=None):
-    annotated = image.copy()
+    # Gray captures are promoted so the annotation colors survive
+    annotated = cv2.cvtColor(image, cv2.COLOR_GRAY2BGR) if image.ndim == 2 else image.copy()
     x1, y1 = max(0, x - width // 2), max(0, y - height // 2)
     x2, y2 = min(image.shape[1], x + width // 2), min(image.shape[0], y + height // 2)
 
-    cv2.rectangle(annotated, (x1, y1), (x2, y2), (0, 255, 0), 2)
-    cv2.circle(annotated, (x, y), 5, (0, 0, 255), -1)
+    cv2.rectangle(annotated, (x1, y1), (x2, y2), BOX_COLOR, 2)
+    cv2.circle(annotated, (x, y), 5, DOT_COLOR, -1)
 
     label_text = f"{label} ({confidence:.2f})" if confidence else label
-    font, font_scale, thickness = cv2.FONT_HERSHEY_SIMPLEX, 0.6, 2
-    (text_w, text_h), _ = cv2.getTextSize(label_text, font, font_scale, thickness)
+    (text_w, text_h), _ = _text_extent(label_text)
 
     text_y = y1 - text_h - 10 if y1 - text_h - 10 > 0 else y2 + text_h + 10
-    overlay = annotated.copy()
-    cv2.rectangle(overlay, (x1, text_y - text_h - 5), (x1 + text_w + 5, text_y + 5), (0, 0, 0), -1)
-    cv2.addWeighted(overlay, 0.6, annotated, 0.4, 0, annotated)
-    cv2.putText(annotated, label_text, (x1 + 2, text_y - 2), font, font_scale, (0, 255, 0), thickness)
+    # Darken only the label backdrop, blending a black box at 0.6 leaves 0.4 of the pixels underneath
+    banner = annotated[max(0, text_y - text_h - 5):text_y + 6, x1:x1 + text_w + 6]
+    cv2.convertScaleAbs(banner, banner, 0.4)
+    cv2.putText(annotated, label_text, (x1 + 2, text_y - 2), LABEL_FONT, LABEL_FONT_SCALE, BOX_COLOR, LABEL_THICKNESS)
 
     return annotated
 
 
+#Baseline and dispatched SIMD feature names of the installed OpenCV build, parsed from its build information
+@functools.lru_cache(maxsize=1)
+def opencv_simd_features():
+    baseline, dispatched = (), ()
+    for line in cv2.getBuildInformation().splitlines():
+        key, _, value = line.strip().partition(":")
+        if key == "Baseline":
+            baseline = tuple(value.split())
+        elif key == "Dispatched code generation":
+            dispatched = tuple(value.split())
+    return baseline, dispatched
+
+
+#Baseline and dispatched SIMD sets as one log line, to spot a wheel without AVX2 in the logs
+def opencv_simd_summary():
+    features = [" ".join(feature_set) for feature_set in opencv_simd_features() if feature_set]
+    return " | ".join(features) or "unknown"
+
+
+#The home directory does not change while running, resolve it once
+@functools.lru_cache(maxsize=1)
 def get_desktop_path():
     return Path.home() / "Desktop"
 
 
-def save_candidate_screenshots(screenshot, candidates):
-    import logging
-    logger = logging.getLogger(__name__)
+#Candidate screenshot folder, created on first use only
+@functools.lru_cache(maxsize=1)
+def _candidates_dir():
+    return ensure_directory(get_desktop_path() / "tjm-project" / "detection_screenshots" / "candidates")
 
+
+def save_candidate_screenshots(screenshot, candidates):
     try:
-        candidates_dir = Path.home() / "Desktop" / "tjm-project" / "detection_screenshots" / "candidates"
-        candidates_dir.mkdir(parents=True, exist_ok=True)
+        candidates_dir = _candidates_dir()
+        crop_w, crop_h = CANDIDATE_CROP_SIZE
 
         for idx, candidate in enumerate(candidates, start=1):
+            # Annotate a crop around the hit instead of copying the whole frame per candidate
+            x0 = min(max(0, candidate['x'] - crop_w // 2), max(0, screenshot.shape[1] - crop_w))
+            y0 = min(max(0, candidate['y'] - crop_h // 2), max(0, screenshot.shape[0] - crop_h))
             annotated = annotate_screenshot(
-                screenshot,
-                candidate['x'],
-                candidate['y'],
+                screenshot[y0:y0 + crop_h, x0:x0 + crop_w],
+                candidate['x'] - x0,
+                candidate['y'] - y0,
                 width=60,
                 height=60,
                 label=f"Candidate {idx}: {candidate['text']}",
                 confidence=candidate['score']
             )
-            cv2.imwrite(str(candidates_dir / f"candidate{idx}.png"), annotated)
+            cv2.imwrite(str(candidates_dir / f"candidate{idx}.jpg"), annotated, [cv2.IMWRITE_JPEG_QUALITY, 85])
     except Exception as e:
         logger.warning(f"Failed to save candidate screenshots: {e}")
 
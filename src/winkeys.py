@@ -0,0 +1,125 @@
+import ctypes
+import sys
+
+import pyautogui
+
+INPUT_KEYBOARD = 1
+KEYEVENTF_KEYUP = 0x0002
+KEYEVENTF_UNICODE = 0x0004
+
+# Events per SendInput call, keeps a long text from overflowing the input queue
+SEND_INPUT_CHUNK = 512
+
+VK_CODES = {
+    'backspace': 0x08,
+    'tab': 0x09,
+    'enter': 0x0D,
+    'shift': 0x10,
+    'ctrl': 0x11,
+    'alt': 0x12,
+    'esc': 0x1B,
+    'f4': 0x73,
+}
+
+
+class MOUSEINPUT(ctypes.Structure):
+    _fields_ = [
+        ("dx", ctypes.c_long),
+        ("dy", ctypes.c_long),
+        ("mouseData", ctypes.c_ulong),
+        ("dwFlags", ctypes.c_ulong),
+        ("time", ctypes.c_ulong),
+        ("dwExtraInfo", ctypes.c_size_t),
+    ]
+
+
+class KEYBDINPUT(ctypes.Structure):
+    _fields_ = [
+        ("wVk", ctypes.c_ushort),
+        ("wScan", ctypes.c_ushort),
+        ("dwFlags", ctypes.c_ulong),
+        ("time", ctypes.c_ulong),
+        ("dwExtraInfo", ctypes.c_size_t),
+    ]
+
+
+class _INPUTUNION(ctypes.Union):
+    _fields_ = [("mi", MOUSEINPUT), ("ki", KEYBDINPUT)]
+
+
+class INPUT(ctypes.Structure):
+    _fields_ = [("type", ctypes.c_ulong), ("union", _INPUTUNION)]
+
+
+_user32 = ctypes.windll.user32 if sys.platform == 'win32' else None
+
+
+def _vk(key):
+    if key in VK_CODES:
+        return VK_CODES[key]
+    if len(key) == 1 and key.isalnum():
+        return ord(key.upper())
+    raise ValueError(f"Unsupported key: {key}")
+
+
+def _send(events):
+    for start in range(0, len(events), SEND_INPUT_CHUNK):
+        chunk = events[start:start + SEND_INPUT_CHUNK]
+        batch = (INPUT * len(chunk))(*chunk)
+        sent = _user32.SendInput(len(chunk), batch, ctypes.sizeof(INPUT))
+        if sent != len(chunk):
+            raise ctypes.WinError()
+
+
+def _unicode_event(code_unit, is_down):
+    event = INPUT(type=INPUT_KEYBOARD)
+    event.union.ki.wScan = code_unit
+    event.union.ki.dwFlags = KEYEVENTF_UNICODE if is_down else KEYEVENTF_UNICODE | KEYEVENTF_KEYUP
+    return event
+
+
+def _vk_event(vk, is_down):
+    event = INPUT(type=INPUT_KEYBOARD)
+    event.union.ki.wVk = vk
+    event.union.ki.dwFlags = 0 if is_down else KEYEVENTF_KEYUP
+    return event
+
+
+# Type text as Unicode key events, sent in a few SendInput batches instead of one call per character
+def write(text, interval=0.02):
+    if _user32 is None:
+        # `interval` spaces the keystrokes, pyautogui.PAUSE would only add one sleep after the whole call
+        pyautogui.write(text, interval=interval)
+        return
+
+    events = []
+    for ch in text.replace('\r\n', '\n'):
+        if ch == '\n':
+            # Editors expect a real Enter key for line breaks
+            events += [_vk_event(VK_CODES['enter'], True), _vk_event(VK_CODES['enter'], False)]
+            continue
+        # Characters outside the BMP are sent as their UTF-16 surrogate pair
+        encoded = ch.encode('utf-16-le')
+        for i in range(0, len(encoded), 2):
+            code_unit = int.from_bytes(encoded[i:i + 2], 'little')
+            events += [_unicode_event(code_unit, True), _unicode_event(code_unit, False)]
+    _send(events)
+
+
+# Send (key, is_down) events to the OS in a single SendInput call
+def send_keys(sequence):
+    _send([_vk_event(_vk(key), is_down) for key, is_down in sequence])
+
+
+def hotkey(*keys):
+    if _user32 is None:
+        pyautogui.hotkey(*keys)
+        return
+    send_keys([(key, True) for key in keys] + [(key, False) for key in reversed(keys)])
+
+
+def press(key):
+    if _user32 is None:
+        pyautogui.press(key)
+        return
+    send_keys([(key, True), (key, False)])
@@ -0,0 +1,154 @@
+import ctypes
+import sys
+import time
+from ctypes import wintypes
+
+EVENT_OBJECT_SHOW = 0x8002
+EVENT_OBJECT_NAMECHANGE = 0x800C
+OBJID_WINDOW = 0
+WINEVENT_OUTOFCONTEXT = 0x0000
+PM_REMOVE = 0x0001
+WM_CLOSE = 0x0010
+GW_OWNER = 4
+QS_ALLINPUT = 0x04FF
+
+if sys.platform == 'win32':
+    _user32 = ctypes.WinDLL('user32', use_last_error=True)
+
+    WinEventProcType = ctypes.WINFUNCTYPE(
+        None, wintypes.HANDLE, wintypes.DWORD, wintypes.HWND,
+        wintypes.LONG, wintypes.LONG, wintypes.DWORD, wintypes.DWORD
+    )
+
+    _user32.SetWinEventHook.restype = wintypes.HANDLE
+    _user32.SetWinEventHook.argtypes = [
+        wintypes.DWORD, wintypes.DWORD, wintypes.HMODULE, WinEventProcType,
+        wintypes.DWORD, wintypes.DWORD, wintypes.DWORD
+    ]
+    _user32.UnhookWinEvent.argtypes = [wintypes.HANDLE]
+    _user32.GetWindowTextLengthW.argtypes = [wintypes.HWND]
+    _user32.GetWindowTextW.argtypes = [wintypes.HWND, wintypes.LPWSTR, ctypes.c_int]
+    _user32.MsgWaitForMultipleObjects.argtypes = [
+        wintypes.DWORD, ctypes.c_void_p, wintypes.BOOL, wintypes.DWORD, wintypes.DWORD
+    ]
+    _user32.PeekMessageW.argtypes = [
+        ctypes.POINTER(wintypes.MSG), wintypes.HWND, wintypes.UINT, wintypes.UINT, wintypes.UINT
+    ]
+    _user32.TranslateMessage.argtypes = [ctypes.POINTER(wintypes.MSG)]
+    _user32.DispatchMessageW.argtypes = [ctypes.POINTER(wintypes.MSG)]
+
+    WndEnumProcType = ctypes.WINFUNCTYPE(wintypes.BOOL, wintypes.HWND, wintypes.LPARAM)
+    _user32.EnumWindows.argtypes = [WndEnumProcType, wintypes.LPARAM]
+    _user32.IsWindowVisible.argtypes = [wintypes.HWND]
+    _user32.IsWindow.argtypes = [wintypes.HWND]
+    _user32.GetWindow.argtypes = [wintypes.HWND, wintypes.UINT]
+    _user32.GetWindow.restype = wintypes.HWND
+    _user32.GetClassNameW.argtypes = [wintypes.HWND, wintypes.LPWSTR, ctypes.c_int]
+    _user32.PostMessageW.argtypes = [wintypes.HWND, wintypes.UINT, wintypes.WPARAM, wintypes.LPARAM]
+    _user32.SetForegroundWindow.argtypes = [wintypes.HWND]
+    _user32.GetForegroundWindow.restype = wintypes.HWND
+else:
+    _user32 = None
+
+
+def is_supported():
+    return _user32 is not None
+
+
+def get_window_text(hwnd):
+    length = _user32.GetWindowTextLengthW(hwnd)
+    if length == 0:
+        return ""
+    buffer = ctypes.create_unicode_buffer(length + 1)
+    _user32.GetWindowTextW(hwnd, buffer, length + 1)
+    return buffer.value
+
+
+def get_class_name(hwnd):
+    buffer = ctypes.create_unicode_buffer(256)
+    _user32.GetClassNameW(hwnd, buffer, len(buffer))
+    return buffer.value
+
+
+# Visible top-level windows whose title contains `title`, case-insensitive, in one EnumWindows pass.
+# `class_name` narrows the match to one window class, titles alone also match other apps.
+def find_windows(title, class_name=None):
+    title_lower = title.lower()
+    hwnds = []
+    buffer = ctypes.create_unicode_buffer(512)
+
+    def on_window(hwnd, lparam):
+        if _user32.IsWindowVisible(hwnd) and _user32.GetWindowTextW(hwnd, buffer, len(buffer)):
+            if title_lower in buffer.value.lower() and (class_name is None or get_class_name(hwnd) == class_name):
+                hwnds.append(hwnd)
+        return True
+
+    _user32.EnumWindows(WndEnumProcType(on_window), 0)
+    return hwnds
+
+
+# First visible top-level window owned by `owner`, e.g. a dialog it raised, None when there is none
+def find_owned_window(owner):
+    owned = []
+
+    def on_window(hwnd, lparam):
+        if _user32.IsWindowVisible(hwnd) and _user32.GetWindow(hwnd, GW_OWNER) == owner:
+            owned.append(hwnd)
+            return False
+        return True
+
+    _user32.EnumWindows(WndEnumProcType(on_window), 0)
+    return owned[0] if owned else None
+
+
+def is_window(hwnd):
+    return bool(_user32.IsWindow(hwnd))
+
+
+def close_window(hwnd):
+    _user32.PostMessageW(hwnd, WM_CLOSE, 0, 0)
+
+
+# Bring `hwnd` to the foreground, False when Windows kept another window there
+def activate_window(hwnd):
+    _user32.SetForegroundWindow(hwnd)
+    return _user32.GetForegroundWindow() == hwnd
+
+
+# Block until a window whose title contains `title` is shown or renamed, ignoring the handles in `exclude`.
+# `already_open` is checked once the hooks are live, so a window that appeared just before is not missed.
+def wait_for_window_event(title, timeout, already_open=None, exclude=()):
+    title_lower = title.lower()
+    found = []
+
+    def on_event(hook, event, hwnd, id_object, id_child, thread_id, event_time):
+        if hwnd and id_object == OBJID_WINDOW and hwnd not in exclude and title_lower in get_window_text(hwnd).lower():
+            found.append(hwnd)
+
+    callback = WinEventProcType(on_event)
+    # Two single-event hooks, a range would also deliver every focus, location and value change system-wide
+    hooks = [
+        _user32.SetWinEventHook(event, event, None, callback, 0, 0, WINEVENT_OUTOFCONTEXT)
+        for event in (EVENT_OBJECT_SHOW, EVENT_OBJECT_NAMECHANGE)
+    ]
+    try:
+        if already_open is not None and already_open():
+            return True
+
+        # Out-of-context hooks are delivered through this thread's message queue
+        msg = wintypes.MSG()
+        deadline = time.perf_counter() + timeout
+        while not found:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                return False
+            _user32.MsgWaitForMultipleObjects(0, None, False, int(remaining * 1000), QS_ALLINPUT)
+            while _user32.PeekMessageW(ctypes.byref(msg), None, 0, 0, PM_REMOVE):
+                _user32.TranslateMessage(ctypes.byref(msg))
+                _user32.DispatchMessageW(ctypes.byref(msg))
+        return True
+
+    finally:
+        for hook in hooks:
+            if hook:
+                _user32.UnhookWinEvent(hook)